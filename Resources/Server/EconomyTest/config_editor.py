@@ -6,12 +6,29 @@ from PySide6.QtWidgets import (
     QGridLayout, QComboBox, QLabel, QLineEdit, QPushButton,
     QScrollArea, QGroupBox, QMessageBox, QCheckBox
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
 from PySide6.QtGui import QIntValidator
 
+try:
+    import orjson
+
+    def _dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+    _loads = orjson.loads
+except ImportError:
+    # Same 2-space layout as orjson so the saved file doesn't depend on what is installed.
+    def _dumps(obj):
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+    _loads = json.loads
+
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 CONFIG_FILENAME = os.path.join(SCRIPT_DIR, "config.json")
 LANG_DIR = os.path.join(SCRIPT_DIR, "lang")
+LANG_INDEX_FILENAME = os.path.join(LANG_DIR, "index.json")
+SAVE_DEBOUNCE_MS = 300
+_RTL_LANGS = frozenset({"he", "ar"})
 
 FALLBACK_DEFAULTS = {
     "features": {
@@ -35,6 +52,28 @@ FALLBACK_DEFAULTS = {
     }
 }
 
+# Order of the entry fields in each settings group, laid out two per row.
+LAYOUT_SPEC = {
+    "general": ("autosave_interval_ms",),
+    "money": (
+        "starting_money", "money_per_minute_amount",
+        "money_per_minute_interval_ms", "cool_message_interval_ms"
+    ),
+    "civilian": (
+        "speeding_limit_kmh", "speeding_bonus_per_second",
+        "speeding_bonus_duration_ms", "speeding_cooldown_ms",
+        "min_speed_kmh_for_zigzag", "zigzag_min_turns",
+        "zigzag_final_bonus_amount", "zigzag_prorated_bonus",
+        "zigzag_bonus_duration_ms", "zigzag_cooldown_ms",
+        "wanted_fail_penalty"
+    ),
+    "police": (
+        "police_proximity_range_m", "busted_range_m",
+        "busted_stop_time_ms", "busted_speed_limit_kmh",
+        "bust_bonus_amount", "police_bonus_per_second"
+    )
+}
+
 STYLESHEET = """
     #MainWindow, #ScrollContent {
         background-color: #F0F2F5; /* Light grey background */
@@ -123,14 +162,26 @@ class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setObjectName("MainWindow")
+        self._app = QApplication.instance()
         
-        self.widgets = {}
+        self._translatable = []
+        self._line_edits = []
+        self._checkboxes = []
         self.translations = {}
         self.lang_map = {}
+        self._lang_files = {}
         self.roleplay_dependent_widgets = []
-        self.current_lang = "en"
+        self._roleplay_checkbox = None
+        self._current_tr = {}
+        self._last_saved_json = None
+        self._int_validator = QIntValidator(0, 999999999, self)
+
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(SAVE_DEBOUNCE_MS)
+        self._save_timer.timeout.connect(self._write_config)
         
-        self.load_all_languages()
+        self._discover_languages()
         self.init_ui()
         self.load_config()
         
@@ -139,7 +190,6 @@ class MainWindow(QMainWindow):
     def init_ui(self):
         self.setWindowTitle("UIMPIT Config Editor")
         self.resize(1000, 800)
-        self.setStyleSheet(STYLESHEET)
 
         main_widget = QWidget()
         self.setCentralWidget(main_widget)
@@ -155,6 +205,7 @@ class MainWindow(QMainWindow):
         
         scroll_content = QWidget()
         scroll_content.setObjectName("ScrollContent")
+        self._scroll_content = scroll_content
         scroll_area.setWidget(scroll_content)
         
         self.content_layout = QVBoxLayout(scroll_content)
@@ -163,12 +214,12 @@ class MainWindow(QMainWindow):
         
         main_grid = QGridLayout()
         main_grid.setSpacing(20)
-        main_grid.addWidget(self.create_general_settings(), 0, 0)
-        main_grid.addWidget(self.create_money_settings(), 0, 1)
+        main_grid.addWidget(self._build_group('general_settings_title', 'general'), 0, 0)
+        main_grid.addWidget(self._build_group('money_settings_title', 'money'), 0, 1)
         self.content_layout.addLayout(main_grid)
 
-        self.content_layout.addWidget(self.create_civilian_settings())
-        self.content_layout.addWidget(self.create_police_settings())
+        self.content_layout.addWidget(self._build_group('civilian_settings_title', 'civilian', dependent=True))
+        self.content_layout.addWidget(self._build_group('police_settings_title', 'police', dependent=True))
         self.content_layout.addStretch()
 
         self.main_layout.addLayout(self.create_footer())
@@ -207,13 +258,11 @@ class MainWindow(QMainWindow):
         
         label = QLabel()
         label.setObjectName("EntryLabel") 
-        self.widgets[f"label_{label_key}"] = label
+        self._translatable.append((label, label_key, QLabel.setText))
         
         entry = QLineEdit()
-        entry.setValidator(QIntValidator(0, 999999999))
-        if category not in self.widgets:
-            self.widgets[category] = {}
-        self.widgets[category][key] = entry
+        entry.setValidator(self._int_validator)
+        self._line_edits.append((category, key, entry))
         
         layout.addWidget(label)
         layout.addWidget(entry)
@@ -222,7 +271,7 @@ class MainWindow(QMainWindow):
     def create_group_box(self, title_key, dependent=False):
         """Helper to create and track a QGroupBox."""
         group_box = QGroupBox()
-        self.widgets[title_key] = group_box
+        self._translatable.append((group_box, title_key, QGroupBox.setTitle))
         if dependent:
             self.roleplay_dependent_widgets.append(group_box)
         
@@ -237,6 +286,7 @@ class MainWindow(QMainWindow):
 
         cb_roleplay = self._add_checkbox_to_grid(grid, 0, 0, 'features', 'roleplay_enabled')
         cb_roleplay.stateChanged.connect(self.apply_feature_dependencies)
+        self._roleplay_checkbox = cb_roleplay
         
         self.roleplay_dependent_widgets.append(
             self._add_checkbox_to_grid(grid, 1, 0, 'features', 'speeding_bonus_enabled')
@@ -254,78 +304,87 @@ class MainWindow(QMainWindow):
         return group_box
 
     def _add_checkbox_to_grid(self, grid_layout, row, col, category, key):
-        """Creates and adds a checkbox to the widget map and a grid."""
+        """Creates and adds a checkbox to the checkbox registry and a grid."""
         checkbox = QCheckBox()
-        self.widgets[f"label_{key}"] = checkbox
-        if category not in self.widgets:
-            self.widgets[category] = {}
-        self.widgets[category][key] = checkbox
+        self._translatable.append((checkbox, key, QCheckBox.setText))
+        self._checkboxes.append((category, key, checkbox))
         grid_layout.addWidget(checkbox, row, col)
         return checkbox
 
-    def create_general_settings(self):
-        group_box, grid = self.create_group_box('general_settings_title')
-        grid.addWidget(self.create_labeled_entry('general', 'autosave_interval_ms', 'autosave_interval_ms'), 0, 0)
-        return group_box
-
-    def create_money_settings(self):
-        group_box, grid = self.create_group_box('money_settings_title')
-        grid.addWidget(self.create_labeled_entry('money', 'starting_money', 'starting_money'), 0, 0)
-        grid.addWidget(self.create_labeled_entry('money', 'money_per_minute_amount', 'money_per_minute_amount'), 0, 1)
-        grid.addWidget(self.create_labeled_entry('money', 'money_per_minute_interval_ms', 'money_per_minute_interval_ms'), 1, 0)
-        grid.addWidget(self.create_labeled_entry('money', 'cool_message_interval_ms', 'cool_message_interval_ms'), 1, 1)
-        return group_box
-        
-    def create_civilian_settings(self):
-        group_box, grid = self.create_group_box('civilian_settings_title', dependent=True)
-        grid.addWidget(self.create_labeled_entry('civilian', 'speeding_limit_kmh', 'speeding_limit_kmh'), 0, 0)
-        grid.addWidget(self.create_labeled_entry('civilian', 'speeding_bonus_per_second', 'speeding_bonus_per_second'), 0, 1)
-        grid.addWidget(self.create_labeled_entry('civilian', 'speeding_bonus_duration_ms', 'speeding_bonus_duration_ms'), 1, 0)
-        grid.addWidget(self.create_labeled_entry('civilian', 'speeding_cooldown_ms', 'speeding_cooldown_ms'), 1, 1)
-        grid.addWidget(self.create_labeled_entry('civilian', 'min_speed_kmh_for_zigzag', 'min_speed_kmh_for_zigzag'), 2, 0)
-        grid.addWidget(self.create_labeled_entry('civilian', 'zigzag_min_turns', 'zigzag_min_turns'), 2, 1)
-        grid.addWidget(self.create_labeled_entry('civilian', 'zigzag_final_bonus_amount', 'zigzag_final_bonus_amount'), 3, 0)
-        grid.addWidget(self.create_labeled_entry('civilian', 'zigzag_prorated_bonus', 'zigzag_prorated_bonus'), 3, 1)
-        grid.addWidget(self.create_labeled_entry('civilian', 'zigzag_bonus_duration_ms', 'zigzag_bonus_duration_ms'), 4, 0)
-        grid.addWidget(self.create_labeled_entry('civilian', 'zigzag_cooldown_ms', 'zigzag_cooldown_ms'), 4, 1)
-        grid.addWidget(self.create_labeled_entry('civilian', 'wanted_fail_penalty', 'wanted_fail_penalty'), 5, 0)
-        return group_box
-
-    def create_police_settings(self):
-        group_box, grid = self.create_group_box('police_settings_title', dependent=True)
-        grid.addWidget(self.create_labeled_entry('police', 'police_proximity_range_m', 'police_proximity_range_m'), 0, 0)
-        grid.addWidget(self.create_labeled_entry('police', 'busted_range_m', 'busted_range_m'), 0, 1)
-        grid.addWidget(self.create_labeled_entry('police', 'busted_stop_time_ms', 'busted_stop_time_ms'), 1, 0)
-        grid.addWidget(self.create_labeled_entry('police', 'busted_speed_limit_kmh', 'busted_speed_limit_kmh'), 1, 1)
-        grid.addWidget(self.create_labeled_entry('police', 'bust_bonus_amount', 'bust_bonus_amount'), 2, 0)
-        grid.addWidget(self.create_labeled_entry('police', 'police_bonus_per_second', 'police_bonus_per_second'), 2, 1)
+    def _build_group(self, title_key, category, dependent=False):
+        """Builds a settings group from LAYOUT_SPEC, two entries per row."""
+        group_box, grid = self.create_group_box(title_key, dependent=dependent)
+        keys = LAYOUT_SPEC[category]
+        if len(keys) > 1:
+            # Equal stretch keeps column widths stable when label text changes with the language.
+            grid.setColumnStretch(0, 1)
+            grid.setColumnStretch(1, 1)
+        add = grid.addWidget
+        make = self.create_labeled_entry
+        for i, key in enumerate(keys):
+            add(make(category, key, key), i // 2, i % 2)
         return group_box
 
     def tr(self, key, default_text=None):
-        return self.translations.get(self.current_lang, {}).get(key, default_text or key)
+        return self._current_tr.get(key, default_text or key)
 
-    def load_all_languages(self):
+    def _discover_languages(self):
+        """Builds the language menu from file names; translations are parsed on first use."""
         try:
             if not os.path.isdir(LANG_DIR): return
-            for filename in os.listdir(LANG_DIR):
-                if filename.endswith(".json"):
-                    lang_code = os.path.splitext(filename)[0]
-                    with open(os.path.join(LANG_DIR, filename), 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        self.translations[lang_code] = data
-                        self.lang_map[data.get("lang_name", lang_code)] = lang_code
+            try:
+                with open(LANG_INDEX_FILENAME, 'rb') as f:
+                    index = json.loads(f.read())
+            except (FileNotFoundError, json.JSONDecodeError):
+                index = {}
+            if not isinstance(index, dict):
+                print("Error loading languages: lang/index.json must map language codes to display names")
+                index = {}
+            with os.scandir(LANG_DIR) as it:
+                for entry in it:
+                    name = entry.name
+                    if not name.endswith(".json") or entry.path == LANG_INDEX_FILENAME:
+                        continue
+                    self._lang_files[name[:-5]] = entry.path
+
+            for lang_code in self._lang_files:
+                lang_name = index.get(lang_code)
+                if lang_name is None:
+                    # Not listed in the index, fall back to reading the name from the file itself.
+                    lang_name = self._load_language(lang_code).get("lang_name", lang_code)
+                self.lang_map[lang_name] = lang_code
         except Exception as e:
             print(f"Error loading languages: {e}")
 
+    def _load_language(self, lang_code):
+        """Loads and caches a single language file."""
+        data = self.translations.get(lang_code)
+        if data is None:
+            data = self.translations[lang_code] = self._read_language_file(lang_code)
+        return data
+
+    def _read_language_file(self, lang_code):
+        """Parses a language file, returning an empty dict if it can't be read."""
+        try:
+            path = self._lang_files.get(lang_code) or os.path.join(LANG_DIR, f"{lang_code}.json")
+            with open(path, 'rb') as f:
+                # Intern keys so lookups with the literal keys used by the UI hit the identity fast path.
+                return {sys.intern(k): v for k, v in json.loads(f.read()).items()}
+        except Exception as e:
+            print(f"Error loading language '{lang_code}': {e}")
+            return {}
+
     def on_lang_changed(self, lang_name):
         lang_code = self.lang_map.get(lang_name, "en")
         self.change_language(lang_code)
 
     def change_language(self, lang_code):
-        self.current_lang = lang_code
-        is_rtl = lang_code in ['he', 'ar']
-        
-        QApplication.instance().setLayoutDirection(Qt.RightToLeft if is_rtl else Qt.LeftToRight)
+        # A language file that failed to parse loads as {}; show English rather than raw keys.
+        self._current_tr = self._load_language(lang_code) or self._load_language("en")
+        new_direction = Qt.RightToLeft if lang_code in _RTL_LANGS else Qt.LeftToRight
+        # Changing the direction relayouts the whole window, so only do it when it actually flips.
+        if self._app.layoutDirection() != new_direction:
+            self._app.setLayoutDirection(new_direction)
         
         self.update_ui_language()
 
@@ -334,27 +393,27 @@ class MainWindow(QMainWindow):
         self.save_button.setText(self.tr("save_button"))
         self.reset_button.setText(self.tr("reset_button"))
 
-        for key, widget in self.widgets.items():
-            text = self.tr(key.replace("label_", ""))
-            if isinstance(widget, (QLabel, QCheckBox)):
-                widget.setText(text)
-            elif isinstance(widget, QGroupBox):
-                widget.setTitle(text)
-        
-        self.main_layout.activate()
+        get = self._current_tr.get
+        for widget, key, setter in self._translatable:
+            setter(widget, get(key, key))
 
     def apply_feature_dependencies(self):
+        if self._roleplay_checkbox is None:
+            return
+        is_enabled = self._roleplay_checkbox.isChecked()
+        # Suspend repaints so toggling every dependent widget costs a single update.
+        self._scroll_content.setUpdatesEnabled(False)
         try:
-            is_enabled = self.widgets['features']['roleplay_enabled'].isChecked()
             for widget in self.roleplay_dependent_widgets:
                 widget.setEnabled(is_enabled)
-        except KeyError:
-            pass
+        finally:
+            self._scroll_content.setUpdatesEnabled(True)
 
     def load_config(self):
         try:
-            with open(CONFIG_FILENAME, 'r', encoding='utf-8') as f:
-                self.config_data = json.load(f)
+            with open(CONFIG_FILENAME, 'rb') as f:
+                self.config_data = _loads(f.read())
+            self._last_saved_json = self._config_snapshot()
         except (FileNotFoundError, json.JSONDecodeError):
             self.config_data = {k: v.copy() for k, v in FALLBACK_DEFAULTS.items()}
 
@@ -366,34 +425,70 @@ class MainWindow(QMainWindow):
         
         self.populate_ui()
 
+    def _config_snapshot(self):
+        """Canonical form of config_data, used to detect no-op saves."""
+        return json.dumps(self.config_data, sort_keys=True)
+
     def populate_ui(self):
-        for category, fields in self.widgets.items():
-            if category in self.config_data:
-                for key, widget in fields.items():
-                    value = self.config_data[category].get(key)
-                    if value is not None:
-                        if isinstance(widget, QLineEdit): widget.setText(str(value))
-                        elif isinstance(widget, QCheckBox): widget.setChecked(bool(value))
+        config_data = self.config_data
+        # Only checkbox signals have a slot (roleplay dependencies); block them and apply once below.
+        for _, _, widget in self._checkboxes: widget.blockSignals(True)
+        try:
+            for category, key, widget in self._line_edits:
+                value = config_data[category].get(key)
+                widget.setText("" if value is None else str(value))
+            for category, key, widget in self._checkboxes:
+                value = config_data[category].get(key)
+                widget.setChecked(False if value is None else bool(value))
+        finally:
+            for _, _, widget in self._checkboxes: widget.blockSignals(False)
         self.apply_feature_dependencies()
 
     def save_config(self):
+        """Collects the form values and schedules a write; repeated saves are coalesced."""
+        try:
+            config_data = self.config_data
+            for category, key, widget in self._line_edits:
+                text_value = widget.text().strip()
+                config_data[category][key] = int(text_value) if text_value else 0
+            for category, key, widget in self._checkboxes:
+                config_data[category][key] = widget.isChecked()
+        except Exception as e:
+            QMessageBox.critical(self, self.tr("error_title"), f"{self.tr('error_invalid_input')}\n\nDetails: {e}")
+            return
+
+        if self._config_snapshot() == self._last_saved_json:
+            # Nothing changed since the last write, skip the disk I/O entirely.
+            self._save_timer.stop()
+            QMessageBox.information(self, self.tr("success_save_title"), self.tr("success_save_message"))
+            return
+
+        self._save_timer.start()
+
+    def _write_config(self):
+        """Serializes the config in memory and atomically replaces the file with one write."""
+        self._save_timer.stop()
+        tmp_filename = CONFIG_FILENAME + ".tmp"
         try:
-            for category, fields in self.widgets.items():
-                if category in self.config_data:
-                    for key, widget in fields.items():
-                        if isinstance(widget, QLineEdit):
-                            text_value = widget.text().strip()
-                            self.config_data[category][key] = int(text_value) if text_value else 0
-                        elif isinstance(widget, QCheckBox):
-                            self.config_data[category][key] = widget.isChecked()
-            
-            with open(CONFIG_FILENAME, 'w', encoding='utf-8') as f:
-                json.dump(self.config_data, f, indent=4, ensure_ascii=False)
+            payload = _dumps(self.config_data)
+            with open(tmp_filename, 'wb', buffering=max(8192, len(payload))) as f:
+                f.write(payload)
+            os.replace(tmp_filename, CONFIG_FILENAME)
+            self._last_saved_json = self._config_snapshot()
 
             QMessageBox.information(self, self.tr("success_save_title"), self.tr("success_save_message"))
 
         except Exception as e:
-            QMessageBox.critical(self, self.tr("error_title"), f"{self.tr('error_invalid_input')}\n\nDetails: {e}")
+            try:
+                os.remove(tmp_filename)
+            except OSError:
+                pass
+            QMessageBox.critical(self, self.tr("error_title"), f"{self.tr('error_save_failed')}\n\nDetails: {e}")
+
+    def closeEvent(self, event):
+        if self._save_timer.isActive():
+            self._write_config()
+        super().closeEvent(event)
 
     def reset_to_defaults(self):
         reply = QMessageBox.question(self, self.tr("confirm_reset_title"), self.tr("confirm_reset_message"),
@@ -405,6 +500,7 @@ class MainWindow(QMainWindow):
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
+    app.setStyleSheet(STYLESHEET)
     window = MainWindow()
     window.show()
     sys.exit(app.exec())